@@ -6,47 +6,167 @@ Description: A modern text expander with dual mode (Hotkey & Auto-expand)
 """
 
 import sys
+import bisect
+import heapq
 import json
 import os
+import queue
+from collections import Counter, deque
+from contextlib import contextmanager
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
-                             QLineEdit, QComboBox, QTextEdit, QLabel, QDialog,
+                             QTableView, QLineEdit, QComboBox, QTextEdit, QLabel, QDialog,
                              QMessageBox, QFileDialog, QSystemTrayIcon, QMenu,
-                             QHeaderView, QGroupBox, QCheckBox, QSpinBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QIcon, QFont, QColor
+                             QHeaderView, QGroupBox, QCheckBox, QSpinBox, QStyle)
+from PyQt5.QtCore import (Qt, QObject, QEvent, pyqtSignal, pyqtSlot, QTimer, QAbstractTableModel,
+                          QSortFilterProxyModel, QModelIndex)
+from PyQt5.QtGui import QFont, QColor
 from pynput import keyboard
 from pynput.keyboard import Key, Controller
-import pyperclip
 import sqlite3
+import threading
 import time
 
+try:
+    import orjson
+except ImportError:  # Optional, export falls back to the json module
+    orjson = None
 
-class KeyboardMonitor(QThread):
-    """Thread for monitoring keyboard input"""
+
+# Trie node entry holding the keyword that ends at that node
+_PHRASE_KEY = "_phrase"
+
+# Tray icon, built on first use because icons need a QApplication
+_TRAY_ICON = None
+
+
+def _tray_icon():
+    """Get the shared tray icon"""
+    global _TRAY_ICON
+    if _TRAY_ICON is None:
+        # Standard style icon (should be replaced with a valid icon file)
+        _TRAY_ICON = QApplication.style().standardIcon(QStyle.SP_ComputerIcon) # type: ignore
+    return _TRAY_ICON
+
+
+class KeyboardMonitor(QObject):
+    """Monitors keyboard input through a pynput listener thread"""
     expansion_triggered = pyqtSignal(str, str)  # keyword, phrase
+    clipboard_requested = pyqtSignal(str)  # phrase, must be set before pasting
 
     def __init__(self):
         super().__init__()
         self.is_running = False
         self.mode = "hotkey"  # "hotkey" or "auto"
-        self.shortcuts = {}
-        self.buffer = ""
-        self.last_key_time = time.time()
+        self._phrase_map = {}
+        # The trie is changed on the GUI thread while the listener thread
+        # walks it; each change is a single dict operation or attribute
+        # assignment, which the GIL keeps atomic, so no lock is taken
+        self._trie_root = {}
+        self.buffer = deque(maxlen=64)
+        self.reset_word()
+        self.last_key_time = time.monotonic()
         self.ctrl_pressed = False
         self.listener = None
         self.keyboard_controller = Controller()
-        self.pending_expansion = False
+        self.pending_expansion = threading.Event()
+        # (keyword, phrase) pairs waiting to be typed by _expand_worker
+        self._expand_q = queue.Queue()
 
     def set_shortcuts(self, shortcuts):
-        """Update shortcuts dictionary"""
-        self.shortcuts = shortcuts
+        """Update shortcuts dictionary and rebuild the keyword trie"""
+        # An empty keyword would sit on the trie root and match every boundary
+        phrase_map = {k.lower(): v for k, v in shortcuts.items() if k}
+        root = {}
+        for keyword in phrase_map:
+            self._insert_keyword(root, keyword)
+        self._phrase_map = phrase_map
+        self._trie_root = root
+        # A word longer than every keyword can never match, so only the
+        # tail the trie could still use is kept
+        self.buffer = deque(maxlen=max(map(len, phrase_map), default=0) + 1)
+        self.reset_word()
+
+    @staticmethod
+    def _insert_keyword(root, keyword):
+        """Add a lowercase keyword to the trie rooted at root"""
+        node = root
+        for ch in keyword:
+            child = node.get(ch)
+            if child is None:
+                # Upper-case input steps to the same node, so typed
+                # characters never need lowercasing
+                child = node[ch] = {}
+                upper = ch.upper()
+                if len(upper) == 1 and upper != ch:
+                    node[upper] = child
+            node = child
+        node[_PHRASE_KEY] = keyword
+
+    def add_keyword(self, keyword, phrase):
+        """Add or replace a single shortcut"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        self._phrase_map[keyword] = phrase
+        self._insert_keyword(self._trie_root, keyword)
+        if len(keyword) >= (self.buffer.maxlen or 0):
+            self.buffer = deque(self.buffer, maxlen=len(keyword) + 1)
+
+    def remove_keyword(self, keyword):
+        """Remove a single shortcut"""
+        keyword = keyword.lower()
+        if self._phrase_map.pop(keyword, None) is None:
+            return
+        path = []
+        node = self._trie_root
+        for ch in keyword:
+            path.append((node, ch))
+            node = node[ch]
+        del node[_PHRASE_KEY]
+        # Prune the branches no other keyword goes through
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+            parent.pop(ch.upper(), None)
 
     def set_mode(self, mode):
         """Set monitoring mode"""
         self.mode = mode
 
+    def reset_word(self):
+        """Forget the word currently being typed"""
+        self.buffer.clear()
+        self._word_len = 0
+        self._trie_node = self._trie_root
+
+    def advance_word(self, char):
+        """Append a typed character and step the trie by one state"""
+        self.buffer.append(char)
+        self._word_len += 1
+        if self._trie_node is not None:
+            self._trie_node = self._trie_node.get(char)
+
+    def backspace_word(self):
+        """Drop the last typed character and re-walk the trie"""
+        if not self._word_len:
+            return
+        self._word_len -= 1
+        if self.buffer:
+            self.buffer.pop()
+        if self._word_len != len(self.buffer):
+            # Part of the word fell off the buffer, it is too long to match
+            self._trie_node = None
+            return
+        node = self._trie_root
+        for ch in self.buffer:
+            node = node.get(ch)
+            if node is None:
+                break
+        self._trie_node = node
+
     def on_press(self, key):
         """Handle key press events"""
         if not self.is_running:
@@ -54,16 +174,16 @@ class KeyboardMonitor(QThread):
 
         try:
            # Suppress the trigger key if expansion is pending
-            if self.pending_expansion:
+            if self.pending_expansion.is_set():
                 if key in [Key.space, Key.enter, Key.tab]:
-                    self.pending_expansion = False
+                    self.pending_expansion.clear()
                     return False  # Suppress this key
             
-            current_time = time.time()
+            current_time = time.monotonic()
 
             # Reset buffer if more than 2 seconds between keystrokes
             if current_time - self.last_key_time > 2:
-                self.buffer = ""
+                self.reset_word()
             self.last_key_time = current_time
 
             # Track Ctrl key
@@ -71,33 +191,37 @@ class KeyboardMonitor(QThread):
                 self.ctrl_pressed = True
                 return
 
+            # Only KeyCode has a char; getattr avoids hasattr's exception path
+            char = getattr(key, 'char', None)
+
             # Hotkey mode: Ctrl+Space to expand
             if self.mode == "hotkey":
                 if self.ctrl_pressed and key == Key.space:
                     self.expand_from_buffer()
                     return
 
-                # Build buffer for hotkey mode too
-                if hasattr(key, 'char') and key.char:
-                    self.buffer += key.char
-                elif key == Key.space:
-                    self.buffer += " "
-                elif key == Key.backspace and len(self.buffer) > 0:
-                    self.buffer = self.buffer[:-1]
+                # Track the current word for hotkey mode too
+                if char:
+                    self.advance_word(char)
+                elif key in [Key.space, Key.enter, Key.tab]:
+                    self.reset_word()
+                elif key == Key.backspace:
+                    self.backspace_word()
 
             # Auto-expand mode
             elif self.mode == "auto":
-                if hasattr(key, 'char') and key.char:
-                    self.buffer += key.char
+                if char:
+                    self.advance_word(char)
                 elif key in [Key.space, Key.enter, Key.tab]:
                     # Check if we should expand before the trigger key is processed
-                    if self.check_for_expansion():
-                        self.pending_expansion = True
-                        self.expand_from_buffer()
+                    keyword = self.check_for_expansion()
+                    if keyword is not None:
+                        self.pending_expansion.set()
+                        self.expand_from_buffer(keyword)
                         return False  # Suppress the trigger key
-                    self.buffer = ""
-                elif key == Key.backspace and len(self.buffer) > 0:
-                    self.buffer = self.buffer[:-1]
+                    self.reset_word()
+                elif key == Key.backspace:
+                    self.backspace_word()
                   
         except Exception as e:
             print(f"Error in on_press: {e}")
@@ -108,55 +232,65 @@ class KeyboardMonitor(QThread):
             self.ctrl_pressed = False
 
     def check_for_expansion(self):
-        """Check if buffer contains a keyword that should be expanded"""
-        words = self.buffer.strip().split()
-        if not words:
-            return False
-        keyword = words[-1].lower()
-        return keyword in self.shortcuts  
+        """Return the keyword just typed if it should be expanded, else None"""
+        node = self._trie_node
+        return node.get(_PHRASE_KEY) if node is not None else None
 
-    def expand_from_buffer(self):
-        """Check buffer for keywords and expand"""
-        words = self.buffer.strip().split()
-        if not words:
+    def expand_from_buffer(self, keyword=None):
+        """Queue expansion of the given keyword, or the word just typed if it is one"""
+        if keyword is None:
+            keyword = self.check_for_expansion()
+        phrase = self._phrase_map.get(keyword) if keyword is not None else None
+        if phrase is None:
             return
 
-        keyword = words[-1].lower()
+        # Typing is left to the worker so the listener callback returns at once
+        self._expand_q.put((keyword, phrase))
 
-        if keyword in self.shortcuts:
-            phrase = self.shortcuts[keyword]
+        # Clear buffer after expansion
+        self.reset_word()
 
-            # Delete the keyword
-            for _ in range(len(keyword)):
-                self.keyboard_controller.press(Key.backspace)
-                self.keyboard_controller.release(Key.backspace)
-                time.sleep(0.01)
+    def _expand_worker(self):
+        """Type out queued expansions until stop() sends None"""
+        while True:
+            item = self._expand_q.get()
+            if item is None:
+                break
+            try:
+                self.type_expansion(*item)
+            except Exception as e:
+                print(f"Error in expansion: {e}")
 
-            # Copy phrase to clipboard and paste
-            pyperclip.copy(phrase)
-            time.sleep(0.05)
+    def type_expansion(self, keyword, phrase):
+        """Replace the typed keyword with its phrase"""
+        # Delete the keyword, pynput delivers synthetic events in order
+        for _ in range(len(keyword)):
+            self.keyboard_controller.tap(Key.backspace)
 
-            # Paste using Ctrl+V
-            self.keyboard_controller.press(Key.ctrl)
-            self.keyboard_controller.press('v')
-            time.sleep(0.05)
-            self.keyboard_controller.release('v')
-            self.keyboard_controller.release(Key.ctrl)
+        # Copy phrase to clipboard; the receiver is connected blocking,
+        # so the clipboard is set by the time emit() returns
+        self.clipboard_requested.emit(phrase)
 
-            # Emit signal for statistics
-            self.expansion_triggered.emit(keyword, phrase)
+        # Paste using Ctrl+V
+        with self.keyboard_controller.pressed(Key.ctrl):
+            self.keyboard_controller.tap('v')
 
-            # Clear buffer after expansion
-            self.buffer = ""
+        # Emit signal for statistics
+        self.expansion_triggered.emit(keyword, phrase)
 
-    def run(self):
+    def start(self):
         """Start keyboard listener"""
         self.is_running = True
-        with keyboard.Listener(on_press=self.on_press, on_release=self.on_release) as self.listener:
-            self.listener.join()
+        threading.Thread(target=self._expand_worker, daemon=True).start()
+        # The listener runs its own thread; signals emitted from it are
+        # queued to the GUI thread
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self.listener.start()
 
     def stop(self):
         """Stop keyboard listener"""
+        if self.is_running:
+            self._expand_q.put(None)  # Ends _expand_worker
         self.is_running = False
         if self.listener:
             self.listener.stop()
@@ -168,118 +302,150 @@ class Database:
     
     def __init__(self, db_path="quicktext_data.db"):
         self.db_path = db_path
+        # One connection for the whole session, only used from the GUI thread
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        # Expansion counts not yet written, see flush_usage()
+        self._pending_usage = Counter()
+        # Result of get_all_shortcuts(), reset by every mutation except usage
+        self._cache = None
+        self._cache_index = {}
+        # keyword -> id, so usage updates go straight to the rowid
+        self._id_by_keyword = None
         self.init_database()
     
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements as a single transaction"""
+        self.conn.execute('BEGIN')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+    
+    def _invalidate(self):
+        """Drop cached query results after the shortcuts table changed"""
+        self._cache = None
+        self._id_by_keyword = None
+    
+    def _keyword_ids(self):
+        """Get the keyword -> id map, loading it if needed"""
+        if self._id_by_keyword is None:
+            self._id_by_keyword = dict(self.conn.execute('SELECT keyword, id FROM shortcuts'))
+        return self._id_by_keyword
+    
     def init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Shortcuts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS shortcuts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT UNIQUE NOT NULL,
-                phrase TEXT NOT NULL,
-                category TEXT DEFAULT 'General',
-                usage_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Settings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        ''')
-        
-        # Insert default shortcuts if empty
-        cursor.execute('SELECT COUNT(*) FROM shortcuts')
-        if cursor.fetchone()[0] == 0:
-            default_shortcuts = [
-                ('tady', 'Thank you very much in advance.', 'Thanks'),
-                ('tassist', 'Thank you for your assistance.', 'Thanks'),
-                ('tcontact', 'Thank you very much for contacting us.', 'Thanks'),
-                ('tcoop', 'Thank you very much for your cooperation.', 'Thanks'),
-                ('temail', 'Thank you for the e-mail.', 'Thanks'),
-                ('hello', 'Hello, how can I help you today?', 'Greetings'),
-                ('bye', 'Thank you and have a great day!', 'Closing'),
-            ]
-            cursor.executemany(
-                'INSERT INTO shortcuts (keyword, phrase, category) VALUES (?, ?, ?)',
-                default_shortcuts
-            )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            # Shortcuts table
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS shortcuts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    keyword TEXT UNIQUE NOT NULL,
+                    phrase TEXT NOT NULL,
+                    category TEXT DEFAULT 'General',
+                    usage_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Settings table
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            
+            # Insert default shortcuts if empty
+            if conn.execute('SELECT COUNT(*) FROM shortcuts').fetchone()[0] == 0:
+                default_shortcuts = [
+                    ('tady', 'Thank you very much in advance.', 'Thanks'),
+                    ('tassist', 'Thank you for your assistance.', 'Thanks'),
+                    ('tcontact', 'Thank you very much for contacting us.', 'Thanks'),
+                    ('tcoop', 'Thank you very much for your cooperation.', 'Thanks'),
+                    ('temail', 'Thank you for the e-mail.', 'Thanks'),
+                    ('hello', 'Hello, how can I help you today?', 'Greetings'),
+                    ('bye', 'Thank you and have a great day!', 'Closing'),
+                ]
+                conn.executemany(
+                    'INSERT INTO shortcuts (keyword, phrase, category) VALUES (?, ?, ?)',
+                    default_shortcuts
+                )
     
     def get_all_shortcuts(self):
         """Get all shortcuts"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT id, keyword, phrase, category, usage_count FROM shortcuts ORDER BY keyword')
-        shortcuts = cursor.fetchall()
-        conn.close()
+        if self._cache is not None:
+            return self._cache
+        self.flush_usage()
+        shortcuts = self.conn.execute(
+            'SELECT id, keyword, phrase, category, usage_count FROM shortcuts ORDER BY keyword'
+        ).fetchall()
+        self._cache = shortcuts
+        self._cache_index = {s[1]: i for i, s in enumerate(shortcuts)}
+        self._id_by_keyword = {s[1]: s[0] for s in shortcuts}
         return shortcuts
     
     def add_shortcut(self, keyword, phrase, category):
-        """Add new shortcut"""
+        """Add new shortcut, returns its id or None if the keyword exists"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
+            cursor = self.conn.execute(
                 'INSERT INTO shortcuts (keyword, phrase, category) VALUES (?, ?, ?)',
                 (keyword.lower(), phrase, category)
             )
-            conn.commit()
-            conn.close()
-            return True
+            self._invalidate()
+            return cursor.lastrowid
         except sqlite3.IntegrityError:
-            return False
+            return None
     
     def update_shortcut(self, shortcut_id, keyword, phrase, category):
         """Update existing shortcut"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        # Pending counts are keyed by keyword, write them before a rename
+        self.flush_usage()
+        self.conn.execute(
             'UPDATE shortcuts SET keyword=?, phrase=?, category=?, updated_at=CURRENT_TIMESTAMP WHERE id=?',
             (keyword.lower(), phrase, category, shortcut_id)
         )
-        conn.commit()
-        conn.close()
+        self._invalidate()
     
     def delete_shortcut(self, shortcut_id):
         """Delete shortcut"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM shortcuts WHERE id=?', (shortcut_id,))
-        conn.commit()
-        conn.close()
+        self.flush_usage()
+        self.conn.execute('DELETE FROM shortcuts WHERE id=?', (shortcut_id,))
+        self._invalidate()
     
     def increment_usage(self, keyword):
-        """Increment usage count for a shortcut"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            'UPDATE shortcuts SET usage_count = usage_count + 1 WHERE keyword=?',
-            (keyword.lower(),)
-        )
-        conn.commit()
-        conn.close()
+        """Increment usage count for a shortcut (written on the next flush_usage)"""
+        self._pending_usage[keyword] += 1
+        # Keep the cached row in step instead of dropping the cache
+        i = self._cache_index.get(keyword) if self._cache is not None else None
+        if i is not None:
+            row = self._cache[i]
+            self._cache[i] = row[:4] + (row[4] + 1,)
+    
+    def flush_usage(self):
+        """Write pending usage counts in a single transaction"""
+        if not self._pending_usage:
+            return
+        pending, self._pending_usage = self._pending_usage, Counter()
+        ids = self._keyword_ids()
+        with self._transaction() as conn:
+            conn.executemany(
+                'UPDATE shortcuts SET usage_count = usage_count + ? WHERE id=?',
+                [(count, ids[keyword]) for keyword, count in pending.items() if keyword in ids]
+            )
     
     def get_categories(self):
         """Get all unique categories"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT DISTINCT category FROM shortcuts ORDER BY category')
-        categories = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return categories
-    
-    def export_data(self, filepath):
+        rows = self.conn.execute('SELECT DISTINCT category FROM shortcuts ORDER BY category').fetchall()
+        return [row[0] for row in rows]
+    
+    def export_data(self, filepath, indent=True):
         """Export all data to JSON"""
         shortcuts = self.get_all_shortcuts()
         data = {
@@ -293,37 +459,122 @@ class Database:
             ],
             'exported_at': datetime.now().isoformat()
         }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                if indent:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
     
     def import_data(self, filepath):
         """Import data from JSON"""
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for shortcut in data['shortcuts']:
-            try:
-                cursor.execute(
-                    'INSERT OR REPLACE INTO shortcuts (keyword, phrase, category, usage_count) VALUES (?, ?, ?, ?)',
-                    (shortcut['keyword'], shortcut['phrase'], shortcut['category'], shortcut.get('usage_count', 0))
-                )
-            except:
-                pass
-        
-        conn.commit()
-        conn.close()
+        self.flush_usage()
+        rows = [
+            (s['keyword'].lower(), s['phrase'], s['category'], s.get('usage_count', 0))
+            for s in data['shortcuts']
+        ]
+        with self._transaction() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO shortcuts (keyword, phrase, category, usage_count) VALUES (?, ?, ?, ?)',
+                rows
+            )
+        self._invalidate()
+
+
+class ShortcutTableModel(QAbstractTableModel):
+    """Table model over (id, keyword, phrase, category, usage) tuples"""
+    
+    HEADERS = ["ID", "Keyword", "Phrase", "Category", "Usage"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shortcuts = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._shortcuts)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return str(self._shortcuts[index.row()][index.column()])
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def shortcut(self, row):
+        """Get the shortcut tuple shown in a row"""
+        return self._shortcuts[row]
+    
+    def set_shortcuts(self, shortcuts):
+        """Replace all rows"""
+        self.beginResetModel()
+        self._shortcuts = list(shortcuts)
+        self.endResetModel()
+    
+    def append_shortcut(self, shortcut):
+        """Add a row at the end, returns its row number"""
+        row = len(self._shortcuts)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._shortcuts.append(shortcut)
+        self.endInsertRows()
+        return row
+    
+    def update_shortcut(self, row, shortcut):
+        """Replace the contents of a row"""
+        self._shortcuts[row] = shortcut
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+    
+    def has_category(self, category):
+        """Check whether any row uses a category"""
+        return any(s[3] == category for s in self._shortcuts)
+    
+    def remove_shortcut(self, row):
+        """Remove a row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._shortcuts[row]
+        self.endRemoveRows()
+
+
+class ShortcutFilterProxyModel(QSortFilterProxyModel):
+    """Filters shortcuts by search text and category"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._search_text = ""
+        self._category = None
+    
+    def set_filter(self, search_text, category=None):
+        """Set the search text and category (None for all) to filter on"""
+        self._search_text = search_text.lower()
+        self._category = category
+        self.invalidateFilter()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        shortcut = self.sourceModel().shortcut(source_row) # type: ignore
+        if self._category is not None and shortcut[3] != self._category:
+            return False
+        return self._search_text in shortcut[1].lower() or self._search_text in shortcut[2].lower()
 
 
 class AddShortcutDialog(QDialog):
     """Dialog for adding/editing shortcuts"""
     
-    def __init__(self, parent=None, edit_mode=False, shortcut_data=None):
+    def __init__(self, parent=None, edit_mode=False, shortcut_data=None, categories=None):
         super().__init__(parent)
         self.edit_mode = edit_mode
         self.shortcut_data = shortcut_data
+        self.categories = categories
         self.init_ui()
     
     def init_ui(self):
@@ -352,8 +603,7 @@ class AddShortcutDialog(QDialog):
         category_label = QLabel("Category:")
         self.category_input = QComboBox()
         self.category_input.setEditable(True)
-        db = Database()
-        categories = db.get_categories()
+        categories = self.categories
         if not categories:
             categories = ['Thanks', 'Greetings', 'Closing', 'Opening', 'Apologies']
         self.category_input.addItems(categories)
@@ -391,9 +641,10 @@ class AddShortcutDialog(QDialog):
 class SettingsDialog(QDialog):
     """Settings dialog"""
     
-    def __init__(self, parent=None, current_mode="hotkey"):
+    def __init__(self, parent=None, current_mode="hotkey", pretty_export=True):
         super().__init__(parent)
         self.current_mode = current_mode
+        self.pretty_export = pretty_export
         self.init_ui()
     
     def init_ui(self):
@@ -419,6 +670,17 @@ class SettingsDialog(QDialog):
         mode_group.setLayout(mode_layout)
         layout.addWidget(mode_group)
         
+        # Export options
+        export_group = QGroupBox("Export")
+        export_layout = QVBoxLayout()
+        
+        self.pretty_export_check = QCheckBox("Pretty-print exported JSON")
+        self.pretty_export_check.setChecked(self.pretty_export)
+        export_layout.addWidget(self.pretty_export_check)
+        
+        export_group.setLayout(export_layout)
+        layout.addWidget(export_group)
+        
         # Buttons
         button_layout = QHBoxLayout()
         close_btn = QPushButton("Close")
@@ -432,13 +694,18 @@ class SettingsDialog(QDialog):
     def get_mode(self):
         """Get selected mode"""
         return "hotkey" if self.mode_combo.currentIndex() == 0 else "auto"
+    
+    def get_pretty_export(self):
+        """Get whether exports should be indented"""
+        return self.pretty_export_check.isChecked()
 
 
 class StatisticsDialog(QDialog):
     """Statistics dialog"""
     
-    def __init__(self, parent=None):
+    def __init__(self, db, parent=None):
         super().__init__(parent)
+        self.db = db
         self.init_ui()
     
     def init_ui(self):
@@ -448,8 +715,7 @@ class StatisticsDialog(QDialog):
         
         layout = QVBoxLayout()
         
-        db = Database()
-        shortcuts = db.get_all_shortcuts()
+        shortcuts = self.db.get_all_shortcuts()
         
         # Summary
         total_shortcuts = len(shortcuts)
@@ -468,14 +734,15 @@ class StatisticsDialog(QDialog):
         table.setColumnCount(4)
         table.setHorizontalHeaderLabels(["Rank", "Keyword", "Phrase", "Usage Count"])
         
-        # Sort by usage
-        sorted_shortcuts = sorted(shortcuts, key=lambda x: x[4], reverse=True)[:10]
-        table.setRowCount(len(sorted_shortcuts))
+        # Top by usage, without sorting the whole list
+        top_shortcuts = heapq.nlargest(10, shortcuts, key=lambda x: x[4])
+        table.setRowCount(len(top_shortcuts))
         
-        for i, shortcut in enumerate(sorted_shortcuts):
+        for i, shortcut in enumerate(top_shortcuts):
             table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             table.setItem(i, 1, QTableWidgetItem(shortcut[1]))
-            table.setItem(i, 2, QTableWidgetItem(shortcut[2][:50] + "..."))
+            phrase = shortcut[2]
+            table.setItem(i, 2, QTableWidgetItem(phrase if len(phrase) <= 50 else phrase[:50] + "..."))
             table.setItem(i, 3, QTableWidgetItem(str(shortcut[4])))
         
         header = table.horizontalHeader()
@@ -494,12 +761,28 @@ class StatisticsDialog(QDialog):
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Tray menu shared by all windows, see _build_tray_menu()
+    _tray_menu = None
+    _tray_menu_app = None
+    
     def __init__(self):
         super().__init__()
         self.db = Database()
+        self.tray_icon = None
+        self._tray_hint_shown = False
         self.monitor = KeyboardMonitor()
         self.monitor.expansion_triggered.connect(self.on_expansion)
+        self.monitor.clipboard_requested.connect(self.set_clipboard_text, Qt.BlockingQueuedConnection)
         self.is_monitoring = False
+        self.pretty_export = True
+        self._categories = []
+        self._row_by_keyword = {}
+        # Usage counts are written in batches, at most 2s after an expansion
+        self._usage_timer = QTimer(self)
+        self._usage_timer.setSingleShot(True)
+        self._usage_timer.setInterval(2000)
+        self._usage_timer.timeout.connect(self.db.flush_usage)
+        QApplication.instance().aboutToQuit.connect(self.db.flush_usage) # type: ignore
         self.init_ui()
         self.load_shortcuts()
         self.setup_tray()
@@ -522,14 +805,16 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(toolbar)
         
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["ID", "Keyword", "Phrase", "Category", "Usage"])
+        self.model = ShortcutTableModel(self)
+        self.proxy = ShortcutFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         header = self.table.horizontalHeader()
         if header is not None:
             header.setStretchLastSection(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setColumnWidth(0, 50)
         self.table.setColumnWidth(1, 150)
         self.table.setColumnWidth(2, 350)
@@ -593,7 +878,12 @@ class MainWindow(QMainWindow):
         # Search
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("🔍 Search shortcuts...")
-        self.search_input.textChanged.connect(self.filter_shortcuts)
+        # Filter once typing pauses rather than on every keystroke
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self.filter_shortcuts)
+        self.search_input.textChanged.connect(lambda _: self._filter_timer.start())
         self.search_input.setMaximumWidth(300)
         layout.addWidget(self.search_input)
         
@@ -639,30 +929,47 @@ class MainWindow(QMainWindow):
     def load_shortcuts(self):
         """Load shortcuts from database"""
         shortcuts = self.db.get_all_shortcuts()
-        self.table.setRowCount(len(shortcuts))
-
-        for i, shortcut in enumerate(shortcuts):
-            self.table.setItem(i, 0, QTableWidgetItem(str(shortcut[0])))
-            self.table.setItem(i, 1, QTableWidgetItem(shortcut[1]))
-            self.table.setItem(i, 2, QTableWidgetItem(shortcut[2]))
-            self.table.setItem(i, 3, QTableWidgetItem(shortcut[3]))
-            self.table.setItem(i, 4, QTableWidgetItem(str(shortcut[4])))
+        self.model.set_shortcuts(shortcuts)
+        self._row_by_keyword = {s[1]: i for i, s in enumerate(shortcuts)}
 
         # Update category filter
-        categories = self.db.get_categories()
+        self._categories = self.db.get_categories()
         self.category_filter.clear()
         self.category_filter.addItem("All Categories")
-        self.category_filter.addItems(categories)
+        self.category_filter.addItems(self._categories)
 
         # Update monitor shortcuts
         self.update_monitor_shortcuts()
     
+    def selected_row(self):
+        """Get the model row of the selected shortcut, or -1"""
+        index = self.table.currentIndex()
+        return self.proxy.mapToSource(index).row() if index.isValid() else -1
+    
+    def add_category(self, category):
+        """Add a category to the cached list and the filter if it is new"""
+        i = bisect.bisect_left(self._categories, category)
+        if i < len(self._categories) and self._categories[i] == category:
+            return
+        self._categories.insert(i, category)
+        self.category_filter.insertItem(i + 1, category)
+    
+    def remove_category_if_unused(self, category):
+        """Drop a category from the cached list and the filter once no shortcut uses it"""
+        if self.model.has_category(category):
+            return
+        i = bisect.bisect_left(self._categories, category)
+        if i < len(self._categories) and self._categories[i] == category:
+            del self._categories[i]
+            self.category_filter.removeItem(i + 1)
+    
     def update_monitor_shortcuts(self):
         """Update shortcuts in monitor thread"""
         shortcuts = self.db.get_all_shortcuts()
         shortcuts_dict = {s[1]: s[2] for s in shortcuts}
         self.monitor.set_shortcuts(shortcuts_dict)
     
+    @pyqtSlot()
     def toggle_monitoring(self):
         """Toggle keyboard monitoring"""
         if not self.is_monitoring:
@@ -709,39 +1016,51 @@ class MainWindow(QMainWindow):
     
     def add_shortcut(self):
         """Add new shortcut"""
-        dialog = AddShortcutDialog(self)
+        dialog = AddShortcutDialog(self, categories=self._categories)
         if dialog.exec_():
             data = dialog.get_data()
             if data['keyword'] and data['phrase']:
-                if self.db.add_shortcut(data['keyword'], data['phrase'], data['category']):
-                    self.load_shortcuts()
+                shortcut_id = self.db.add_shortcut(data['keyword'], data['phrase'], data['category'])
+                if shortcut_id is not None:
+                    keyword = data['keyword'].lower()
+                    row = self.model.append_shortcut((shortcut_id, keyword, data['phrase'], data['category'], 0))
+                    self._row_by_keyword[keyword] = row
+                    self.monitor.add_keyword(keyword, data['phrase'])
+                    self.add_category(data['category'])
                     QMessageBox.information(self, "Success", "Shortcut added successfully!")
                 else:
                     QMessageBox.warning(self, "Error", "Keyword already exists!")
     
     def edit_shortcut(self):
         """Edit selected shortcut"""
-        selected = self.table.currentRow()
+        selected = self.selected_row()
         if selected < 0:
             QMessageBox.warning(self, "Warning", "Please select a shortcut to edit")
             return
         
-        shortcut_id = int(self.table.item(selected, 0).text()) # type: ignore
-        shortcuts = self.db.get_all_shortcuts()
-        shortcut_data = next((s for s in shortcuts if s[0] == shortcut_id), None)
+        shortcut_data = self.model.shortcut(selected)
+        shortcut_id = shortcut_data[0]
         
-        if shortcut_data:
-            dialog = AddShortcutDialog(self, edit_mode=True, shortcut_data=shortcut_data)
-            if dialog.exec_():
-                data = dialog.get_data()
-                if data['keyword'] and data['phrase']:
-                    self.db.update_shortcut(shortcut_id, data['keyword'], data['phrase'], data['category'])
-                    self.load_shortcuts()
-                    QMessageBox.information(self, "Success", "Shortcut updated successfully!")
+        dialog = AddShortcutDialog(self, edit_mode=True, shortcut_data=shortcut_data, categories=self._categories)
+        if dialog.exec_():
+            data = dialog.get_data()
+            if data['keyword'] and data['phrase']:
+                self.db.update_shortcut(shortcut_id, data['keyword'], data['phrase'], data['category'])
+                keyword = data['keyword'].lower()
+                usage = self.model.shortcut(selected)[4]
+                shortcut = (shortcut_id, keyword, data['phrase'], data['category'], usage)
+                self.model.update_shortcut(selected, shortcut)
+                self._row_by_keyword.pop(shortcut_data[1], None)
+                self._row_by_keyword[keyword] = selected
+                self.monitor.remove_keyword(shortcut_data[1])
+                self.monitor.add_keyword(keyword, data['phrase'])
+                self.add_category(data['category'])
+                self.remove_category_if_unused(shortcut_data[3])
+                QMessageBox.information(self, "Success", "Shortcut updated successfully!")
     
     def delete_shortcut(self):
         """Delete selected shortcut"""
-        selected = self.table.currentRow()
+        selected = self.selected_row()
         if selected < 0:
             QMessageBox.warning(self, "Warning", "Please select a shortcut to delete")
             return
@@ -750,117 +1069,170 @@ class MainWindow(QMainWindow):
                                      "Are you sure you want to delete this shortcut?",
                                      QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            item = self.table.item(selected, 0)
-            if item is not None:
-                shortcut_id = int(item.text())
-                self.db.delete_shortcut(shortcut_id)
-                self.load_shortcuts()
-                QMessageBox.information(self, "Success", "Shortcut deleted successfully!")
-            else:
-                QMessageBox.warning(self, "Error", "Could not find the selected shortcut ID.")
+            shortcut_id, keyword, _, category = self.model.shortcut(selected)[:4]
+            self.db.delete_shortcut(shortcut_id)
+            self.monitor.remove_keyword(keyword)
+            self.model.remove_shortcut(selected)
+            self.remove_category_if_unused(category)
+            # Rows below the removed one move up by one
+            self._row_by_keyword = {k: r - (r > selected) for k, r in self._row_by_keyword.items() if r != selected}
+            QMessageBox.information(self, "Success", "Shortcut deleted successfully!")
     
     def filter_shortcuts(self):
         """Filter shortcuts based on search and category"""
-        search_text = self.search_input.text().lower()
-        category = self.category_filter.currentText()
-        
-        for i in range(self.table.rowCount()):
-            keyword_item = self.table.item(i, 1)
-            phrase_item = self.table.item(i, 2)
-            cat_item = self.table.item(i, 3)
-
-            keyword = keyword_item.text().lower() if keyword_item is not None else ""
-            phrase = phrase_item.text().lower() if phrase_item is not None else ""
-            cat = cat_item.text() if cat_item is not None else ""
-
-            match_search = search_text in keyword or search_text in phrase
-            match_category = category == "All Categories" or category == cat
-
-            self.table.setRowHidden(i, not (match_search and match_category))
+        category = self.category_filter.currentText() if self.category_filter.currentIndex() > 0 else None
+        self.proxy.set_filter(self.search_input.text(), category)
     
     def export_data(self):
         """Export shortcuts to JSON"""
         filepath, _ = QFileDialog.getSaveFileName(self, "Export Data", "", "JSON Files (*.json)")
         if filepath:
-            self.db.export_data(filepath)
+            self.db.export_data(filepath, indent=self.pretty_export)
             QMessageBox.information(self, "Success", "Data exported successfully!")
     
     def import_data(self):
         """Import shortcuts from JSON"""
         filepath, _ = QFileDialog.getOpenFileName(self, "Import Data", "", "JSON Files (*.json)")
         if filepath:
-            self.db.import_data(filepath)
+            try:
+                self.db.import_data(filepath)
+            except (OSError, ValueError, KeyError, TypeError, sqlite3.Error) as e:
+                QMessageBox.warning(self, "Error", f"Could not import data: {e}")
+                return
             self.load_shortcuts()
             QMessageBox.information(self, "Success", "Data imported successfully!")
     
     def show_statistics(self):
         """Show statistics dialog"""
-        dialog = StatisticsDialog(self)
+        dialog = StatisticsDialog(self.db, self)
         dialog.exec_()
     
     def show_settings(self):
         """Show settings dialog"""
         current_mode = "hotkey" if self.mode_combo.currentIndex() == 0 else "auto"
-        dialog = SettingsDialog(self, current_mode)
+        dialog = SettingsDialog(self, current_mode, self.pretty_export)
         if dialog.exec_():
             new_mode = dialog.get_mode()
             self.mode_combo.setCurrentIndex(0 if new_mode == "hotkey" else 1)
+            self.pretty_export = dialog.get_pretty_export()
+    
+    @pyqtSlot(str)
+    def set_clipboard_text(self, text):
+        """Set clipboard text on behalf of the keyboard monitor"""
+        QApplication.clipboard().setText(text) # type: ignore
     
+    @pyqtSlot(str, str)
     def on_expansion(self, keyword, phrase):
         """Handle expansion event"""
         self.db.increment_usage(keyword)
-        self.load_shortcuts()
+        if not self._usage_timer.isActive():
+            self._usage_timer.start()
+
+        row = self._row_by_keyword.get(keyword)
+        if row is not None:
+            shortcut = self.model.shortcut(row)
+            self.model.update_shortcut(row, shortcut[:4] + (shortcut[4] + 1,))
         if hasattr(self, 'status_bar') and self.status_bar is not None:
             self.status_bar.showMessage(f"✅ Expanded: {keyword} → {phrase[:30]}...", 3000)
     
+    @classmethod
+    def _build_tray_menu(cls):
+        """Get the tray menu, building it once per QApplication"""
+        app = QApplication.instance()
+        if cls._tray_menu is None or cls._tray_menu_app is not app:
+            tray_menu = QMenu()
+            # Action data names the window slot setup_tray() connects
+            tray_menu.addAction("Show").setData("show_window") # type: ignore
+            
+            tray_menu.addSeparator()
+            
+            tray_menu.addAction("Start Monitoring").setData("toggle_monitoring") # type: ignore
+            
+            tray_menu.addSeparator()
+            
+            quit_action = tray_menu.addAction("Quit")
+            quit_action.triggered.connect(QApplication.quit) # type: ignore
+            
+            cls._tray_menu = tray_menu
+            cls._tray_menu_app = app
+        return cls._tray_menu
+    
     def setup_tray(self):
         """Setup system tray icon"""
-        self.tray_icon = QSystemTrayIcon(self)
-        # Set a default icon (should be replaced with a valid icon file)
-        self.tray_icon.setIcon(QIcon())
-        
-        # Create tray menu
-        tray_menu = QMenu()
-        show_action = tray_menu.addAction("Show")
-        if show_action is not None:
-            show_action.triggered.connect(self.show)
-        
-        tray_menu.addSeparator()
-        
-        start_action = tray_menu.addAction("Start Monitoring")
-        if start_action is not None:
-            start_action.triggered.connect(self.toggle_monitoring)
-        
-        tray_menu.addSeparator()
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            # Nothing to minimize to, closeEvent quits instead
+            self.tray_icon = None
+            return
         
-        quit_action = tray_menu.addAction("Quit")
-        if quit_action is not None:
-            quit_action.triggered.connect(QApplication.quit)
+        self.tray_icon = QSystemTrayIcon(self)
+        self.tray_icon.setIcon(_tray_icon())
+        
+        # Point the shared menu's actions at this window
+        tray_menu = self._build_tray_menu()
+        for action in tray_menu.actions():
+            slot_name = action.data()
+            if not slot_name:
+                continue
+            try:
+                action.triggered.disconnect()
+            except TypeError:
+                pass  # Not connected yet
+            action.triggered.connect(getattr(self, slot_name))
         
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.setToolTip("QuickText Pro")
         self.tray_icon.show()
     
+    @pyqtSlot()
+    def show_window(self):
+        """Show the window again from the tray"""
+        self.setWindowState(self.windowState() & ~Qt.WindowMinimized) # type: ignore
+        self.show()
+        self.activateWindow()
+    
+    def _maybe_show_tray_hint(self):
+        """Tell the user the app went to the tray, once per session"""
+        if self._tray_hint_shown or not self.tray_icon or not self.tray_icon.supportsMessages():
+            return
+        self._tray_hint_shown = True
+        self.tray_icon.showMessage(
+            "QuickText Pro",
+            "Application minimized to tray",
+            QSystemTrayIcon.MessageIcon.Information,
+            2000
+        )
+    
+    def changeEvent(self, event):
+        """Minimize to the tray like closing does"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and self.isMinimized() and self.tray_icon:
+            QTimer.singleShot(0, self.hide)
+            QTimer.singleShot(0, self._maybe_show_tray_hint)
+    
     def closeEvent(self, event):
         """Handle window close event"""
+        if self.tray_icon is None:
+            if self.is_monitoring:
+                self.monitor.stop()
+            event.accept()
+            return
+        
         event.ignore()
-        self.hide()
-        if hasattr(self, 'tray_icon') and self.tray_icon:
-            self.tray_icon.showMessage(
-                "QuickText Pro",
-                "Application minimized to tray",
-                QSystemTrayIcon.MessageIcon.Information,
-                2000
-            )
+        # Hide on the next event loop pass so this handler returns at once
+        QTimer.singleShot(0, self.hide)
+        QTimer.singleShot(0, self._maybe_show_tray_hint)
 
 
 def main():
     """Main entry point"""
     app = QApplication(sys.argv)
+    app.setOrganizationName("QuickText Pro")
     app.setApplicationName("QuickText Pro")
     
-    # Set application style
+    # Set application style before any widget exists, so nothing is
+    # polished twice
     app.setStyle("Fusion")
+    app.style()
     
     window = MainWindow()
     window.show()